@@ -1,16 +1,17 @@
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QTextEdit, QLineEdit, QPushButton, 
                             QLabel, QScrollArea, QFrame, QTextBrowser, QSizePolicy, QSpacerItem)
-from PyQt6.QtCore import Qt, QObject, pyqtSignal, QThread, QSize, QUrl
-from PyQt6.QtGui import QIcon, QColor, QPalette, QFont
+from PyQt6.QtCore import Qt, QObject, pyqtSignal, QThread, QSize, QUrl, QEvent, QRunnable, QThreadPool, QTimer
+from PyQt6.QtGui import QIcon, QColor, QPalette, QFont, QFontMetrics
 
 import sys
 import os
-import markdown
 import re
-from datetime import datetime
-from threading import Thread
+import time
 import queue
+from datetime import datetime
+from functools import lru_cache
+from threading import Thread, local
 
 # Import database functionality
 from app.database import get_message_history_service
@@ -20,13 +21,356 @@ from app.helpers.aurora_logger import log_info, log_debug, log_error
 
 from app.helpers.runAsyncInThread import run_async_in_thread
 
+def _fmt_hms(timestamp=None):
+    """Format a POSIX timestamp (default: now) as local HH:MM:SS"""
+    return time.strftime("%H:%M:%S", time.localtime(timestamp))
+
+def _trunc(text, n=30):
+    """Shorten text to n characters for log lines, marking the cut with '...'"""
+    return text[:n] + ("..." if len(text) > n else "")
+
+# Markdown detection patterns, compiled once for every MessageWidget
+_MD_BOLD = re.compile(r'\*\*.+\*\*')
+_MD_ITALIC = re.compile(r'\*(?!\*).+?\*')
+_MD_HEADER = re.compile(r'#+\s')
+_MD_LIST = re.compile(r'^\s*[-*+]\s', re.MULTILINE)
+
+def _sniff_markdown(text):
+    """Return True if the text looks like it contains markdown.
+
+    Cheap substring checks run first and short-circuit; the regexes only run
+    when the character they need is actually present in the text.
+    """
+    if '```' in text or '|' in text or '](' in text:  # code blocks, potential tables, links
+        return True
+    if '*' in text and (_MD_BOLD.search(text) or _MD_ITALIC.search(text)):  # bold, italic
+        return True
+    if '#' in text and _MD_HEADER.search(text):  # headers
+        return True
+    return _MD_LIST.search(text) is not None  # list items
+
+# Markdown converters; building one loads every extension and compiles its
+# patterns, so each thread (the Qt thread and every render worker) keeps its
+# own and reset()s it between conversions. A converter is not re-entrant, but
+# per-thread instances need no locking. The markdown package itself is
+# imported on first use to keep startup fast.
+_md_local = local()
+
+def _get_markdown():
+    """Return this thread's markdown converter, creating it on first use"""
+    md = getattr(_md_local, 'md', None)
+    if md is None:
+        import markdown
+        md = _md_local.md = markdown.Markdown(extensions=['fenced_code', 'tables'])
+    return md
+
+@lru_cache(maxsize=512)
+def _render_markdown_html(message_str):
+    """Convert a markdown message to HTML.
+
+    Message content never changes once sent, so the result is cached and
+    replayed history or rebuilt widgets skip the conversion entirely.
+    """
+    return _get_markdown().reset().convert(message_str)
+
+class MarkdownRenderTask(QRunnable):
+    """Render a message's markdown on a worker thread and emit the HTML"""
+    def __init__(self, signals, render_id, message_str):
+        super().__init__()
+        self.signals = signals
+        self.render_id = render_id
+        self.message_str = message_str
+    
+    def run(self):
+        try:
+            html_content = _render_markdown_html(self.message_str)
+        except Exception as e:
+            # The widget keeps showing the plain text placeholder
+            log_error(f"Error rendering markdown: {e}")
+            return
+        self.signals.html_ready.emit(self.render_id, html_content)
+
+# MessageWidget rules, added to the window stylesheet by AuroraUI.apply_style.
+# Bubbles only carry object names and "user"/"compact"/"source" properties, so
+# Qt parses these rules once per theme instead of once per widget.
+_MESSAGE_QSS = """
+    #messageBubble QWidget {
+        background-color: transparent;
+    }
+    
+    #messageBubble {
+        border-radius: 12px;
+        padding: 5px;
+    }
+    
+    #messageBubble[user="true"] {
+        background-color: %(user_bubble)s;
+        margin-left: 40px;
+    }
+    
+    #messageBubble[user="true"][compact="true"] {
+        margin-left: 20px;
+    }
+    
+    #messageBubble[user="false"] {
+        background-color: %(assistant_bubble)s;
+        margin-right: 40px;
+    }
+    
+    #messageBubble[user="false"][compact="true"] {
+        margin-right: 20px;
+    }
+    
+    QLabel#messageTimestamp {
+        color: %(timestamp)s;
+        font-size: 10px;
+    }
+    
+    QLabel#roleTag, QLabel#sourceTag {
+        color: white;
+        border-radius: 10px;
+        padding: 2px 6px;
+        font-size: 10px;
+        font-weight: bold;
+    }
+    
+    QLabel#roleTag {
+        margin-right: 4px;
+    }
+    
+    QLabel#roleTag[user="true"] {
+        background-color: %(user_role)s;
+    }
+    
+    QLabel#roleTag[user="false"] {
+        background-color: %(assistant_role)s;
+    }
+    
+    QLabel#sourceTag {
+        background-color: #1E8E3E;
+    }
+    
+    QLabel#sourceTag[source="Text"] {
+        background-color: #555555;
+    }
+    
+    QLabel#messageLabel {
+        font-size: 14px;
+        padding: 6px;
+        margin: 4px;
+    }
+    
+    QLabel#messageLabel[user="true"] {
+        color: %(user_text)s;
+        font-weight: bold;
+    }
+    
+    QLabel#messageLabel[user="false"] {
+        color: %(assistant_text)s;
+    }
+    
+    QTextBrowser#messageDisplay {
+        color: %(assistant_text)s;
+        border: none;
+        selection-background-color: %(selection)s;
+        padding: 5px;
+    }
+"""
+
+_MESSAGE_QSS_DARK = _MESSAGE_QSS % {
+    'user_bubble': '#BB86FC',
+    'assistant_bubble': '#333333',
+    'timestamp': '#AAAAAA',
+    'user_role': '#9C27B0',
+    'assistant_role': '#673AB7',
+    'user_text': '#121212',
+    'assistant_text': '#E0E0E0',
+    'selection': '#444444',
+}
+
+_MESSAGE_QSS_LIGHT = _MESSAGE_QSS % {
+    'user_bubble': '#2196F3',
+    'assistant_bubble': '#F5F5F5',
+    'timestamp': '#777777',
+    'user_role': '#1565C0',
+    'assistant_role': '#00796B',
+    'user_text': 'white',
+    'assistant_text': '#333333',
+    'selection': '#E3F2FD',
+}
+
+# Default stylesheet for the QTextDocument of markdown messages, per theme
+_DOC_CSS = """
+    h1, h2, h3 { margin-top: 0.3em; margin-bottom: 0.3em; }
+    p { margin-top: 0.3em; margin-bottom: 0.3em; }
+    ul, ol { margin-top: 0.3em; margin-bottom: 0.3em; margin-left: 15px; padding-left: 15px; }
+    li { margin-bottom: 0.2em; }
+    pre { margin: 0.5em 0; white-space: pre-wrap; background-color: %s; border: 1px solid %s; border-radius: 5px; padding: 8px; }
+    code { font-family: monospace; white-space: pre-wrap; color: %s; }
+    table { border-collapse: collapse; margin: 0.5em 0; }
+    th, td { border: 1px solid #CCCCCC; padding: 6px; }
+    img { max-width: 100%%; height: auto; }
+"""
+
+_DOC_CSS_DARK = _DOC_CSS % ('#222222', '#444444', '#E0E0E0')
+_DOC_CSS_LIGHT = _DOC_CSS % ('#F5F5F5', '#E0E0E0', '#333333')
+
+# Window-level stylesheet; the message bubble rules are appended per theme
+_WINDOW_QSS = """
+    QMainWindow {
+        background-color: %(window)s;
+        color: %(text)s;
+    }
+    
+    QWidget {
+        background-color: %(window)s;
+        color: %(text)s;
+    }
+    
+    QScrollArea {
+        border: none;
+        background-color: %(chat)s;
+    }
+    
+    QScrollBar:vertical {
+        background: %(scrollbar)s;
+        width: 10px;
+        margin: 0px;
+    }
+    
+    QScrollBar::handle:vertical {
+        background: %(handle)s;
+        min-height: 20px;
+        border-radius: 5px;
+    }
+    
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    
+    QScrollBar:horizontal {
+        background: %(scrollbar)s;
+        height: 10px;
+        margin: 0px;
+    }
+    
+    QScrollBar::handle:horizontal {
+        background: %(handle)s;
+        min-width: 20px;
+        border-radius: 5px;
+    }
+    
+    QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
+        width: 0px;
+    }
+    
+    QLabel {
+        font-size: 14px;
+        color: %(text)s;
+    }
+    
+    QTextBrowser {
+        background-color: transparent;
+        color: %(text)s;
+        border: none;
+        selection-background-color: %(selection)s;
+    }
+"""
+
+_QSS_DARK_MAIN = _WINDOW_QSS % {
+    'window': '#1E1E1E',
+    'text': '#E0E0E0',
+    'chat': '#121212',
+    'scrollbar': '#2D2D2D',
+    'handle': '#555555',
+    'selection': '#444444',
+} + _MESSAGE_QSS_DARK
+
+_QSS_LIGHT_MAIN = _WINDOW_QSS % {
+    'window': 'white',
+    'text': '#333333',
+    'chat': 'white',
+    'scrollbar': '#F5F5F5',
+    'handle': '#CCCCCC',
+    'selection': '#E3F2FD',
+} + _MESSAGE_QSS_LIGHT
+
+_QSS_DARK_BOTTOM = "background-color: #1E1E1E; border-top: 1px solid #333333; padding: 10px;"
+_QSS_LIGHT_BOTTOM = "background-color: #F5F5F5; border-top: 1px solid #E0E0E0; padding: 10px;"
+
+# Scoped to the chat container so it does not override the message bubble rules
+_CHAT_CONTENT_DARK = "#chatContent { background-color: #121212; }"
+_CHAT_CONTENT_LIGHT = "#chatContent { background-color: white; }"
+
+_INPUT_QSS = """
+    QTextEdit {
+        background-color: %s;
+        color: %s;
+        border: 1px solid %s;
+        border-radius: 12px;
+        padding: 8px 12px;
+        font-size: 14px;
+    }
+"""
+
+_QSS_DARK_INPUT = _INPUT_QSS % ('#2D2D2D', '#E0E0E0', '#444444')
+_QSS_LIGHT_INPUT = _INPUT_QSS % ('white', '#333333', '#CCCCCC')
+
+_SEND_BUTTON_QSS = """
+    QPushButton {
+        background-color: %s;
+        color: %s;
+        border: none;
+        border-radius: 12px;
+        padding: 8px 16px;
+        font-weight: bold;
+        font-size: 13px;
+    }
+    
+    QPushButton:hover {
+        background-color: %s;
+    }
+    
+    QPushButton:pressed {
+        background-color: %s;
+    }
+"""
+
+_QSS_DARK_SEND_BTN = _SEND_BUTTON_QSS % ('#BB86FC', '#121212', '#A66EFC', '#7B41CE')
+_QSS_LIGHT_SEND_BTN = _SEND_BUTTON_QSS % ('#2196F3', 'white', '#1976D2', '#0D47A1')
+
+# Shared by the stop, dark mode and load older buttons
+_CONTROL_BUTTON_QSS = """
+    QPushButton {
+        background-color: %s;
+        color: %s;
+        border: none;
+        border-radius: 8px;
+        padding: 4px 12px;
+        font-size: 12px;
+    }
+    
+    QPushButton:hover {
+        background-color: %s;
+    }
+    
+    QPushButton:pressed {
+        background-color: %s;
+    }
+"""
+
+_QSS_DARK_CONTROL_BTN = _CONTROL_BUTTON_QSS % ('#333333', '#E0E0E0', '#444444', '#222222')
+_QSS_LIGHT_CONTROL_BTN = _CONTROL_BUTTON_QSS % ('#E0E0E0', '#333333', '#CCCCCC', '#BBBBBB')
+
 class MessageWidget(QFrame):
     """Custom widget to display messages in the chat history"""
-    def __init__(self, message, is_user=False, parent=None, dark_mode=False, source_type=None):
+    def __init__(self, message, is_user=False, parent=None, dark_mode=False, source_type=None, defer_render=False, timestamp=None, char_width=None):
         super().__init__(parent)
         self.is_user = is_user
         self.dark_mode = dark_mode
         self.source_type = source_type  # "Text" or "STT" or None
+        self._char_width = char_width  # average character width used to size short labels
+        self._sent_at = time.time() if timestamp is None else timestamp
         
         # Set up the frame appearance
         self.setFrameShape(QFrame.Shape.StyledPanel)
@@ -34,248 +378,78 @@ class MessageWidget(QFrame):
         
         # Process the message and get its length immediately for use throughout init
         message_str = str(message)
+        self._message = message_str
         content_length = len(message_str.strip())
+        self._content_length = content_length
+        
+        # Styling comes from the window stylesheet (see AuroraUI.apply_style);
+        # the object names and properties below select the matching rules.
+        # Short messages get less side margin.
+        self.setObjectName("messageBubble")
+        self.setProperty("user", self.is_user)
+        self.setProperty("compact", content_length < 20)
         
         # Create main layout with balanced spacing for proper text display
         main_layout = QVBoxLayout(self)
+        self._main_layout = main_layout
         main_layout.setContentsMargins(8, 5, 8, 5)
         main_layout.setSpacing(3)
         
         # Create top bar with timestamp, role label and source type
         top_bar = QHBoxLayout()
         
-        # Add timestamp
-        timestamp = QLabel(datetime.now().strftime("%H:%M:%S"))
-        if self.dark_mode:
-            timestamp.setStyleSheet("color: #AAAAAA; font-size: 10px; background-color: transparent;")
-        else:
-            timestamp.setStyleSheet("color: #777777; font-size: 10px; background-color: transparent;")
+        # Add timestamp; replayed messages pass the time they were sent
+        self._timestamp = QLabel(_fmt_hms(self._sent_at))
+        self._timestamp.setObjectName("messageTimestamp")
         
         # Create role tag (User or Assistant)
-        role_tag = QLabel("User" if self.is_user else "Assistant")
-        if self.dark_mode:
-            role_tag.setStyleSheet(f"""
-                color: {'white' if self.dark_mode else 'white'};
-                background-color: {'#9C27B0' if self.is_user else '#673AB7'};
-                border-radius: 10px;
-                padding: 2px 6px;
-                margin-right: 4px;
-                font-size: 10px;
-                font-weight: bold;
-            """)
-        else:
-            role_tag.setStyleSheet(f"""
-                color: white;
-                background-color: {'#1565C0' if self.is_user else '#00796B'};
-                border-radius: 10px;
-                padding: 2px 6px;
-                margin-right: 4px;
-                font-size: 10px;
-                font-weight: bold;
-            """)
+        self._role_tag = QLabel("User" if self.is_user else "Assistant")
+        self._role_tag.setObjectName("roleTag")
+        self._role_tag.setProperty("user", self.is_user)
         
         # Create source tag if applicable (Text or STT)
-        source_tag = None
+        self._source_tag = None
         if self.is_user and self.source_type:
-            source_tag = QLabel(self.source_type)
-            source_tag.setStyleSheet(f"""
-                color: {'white' if self.dark_mode else 'white'};
-                background-color: {'#555555' if source_type == 'Text' else '#1E8E3E'};
-                border-radius: 10px;
-                padding: 2px 6px;
-                font-size: 10px;
-                font-weight: bold;
-            """)
+            self._source_tag = QLabel(self.source_type)
+            self._source_tag.setObjectName("sourceTag")
+            self._source_tag.setProperty("source", self.source_type)
         
         # Add widgets to top bar based on alignment
         if self.is_user:
             # For user messages, tags go on left, timestamp on right
-            if source_tag:
-                top_bar.addWidget(role_tag)
-                top_bar.addWidget(source_tag)
-            else:
-                top_bar.addWidget(role_tag)
+            top_bar.addWidget(self._role_tag)
+            if self._source_tag:
+                top_bar.addWidget(self._source_tag)
             top_bar.addStretch()
-            top_bar.addWidget(timestamp)
+            top_bar.addWidget(self._timestamp)
         else:
             # For assistant messages, timestamp on left, tag on right
-            top_bar.addWidget(timestamp)
+            top_bar.addWidget(self._timestamp)
             top_bar.addStretch()
-            top_bar.addWidget(role_tag)
-            if source_tag:
-                top_bar.addWidget(source_tag)
+            top_bar.addWidget(self._role_tag)
+            if self._source_tag:
+                top_bar.addWidget(self._source_tag)
         
         main_layout.addLayout(top_bar)
         
         # Check if this might be markdown content
-        has_markdown = False
-        if not is_user:
-            has_markdown = (
-                '```' in message_str or  # code blocks
-                re.search(r'\*\*.+\*\*', message_str) or  # bold
-                re.search(r'\*.+\*', message_str) or  # italic
-                re.search(r'#+\s', message_str) or  # headers
-                re.search(r'^\s*[-*+]\s', message_str, re.MULTILINE) or  # list items
-                '|' in message_str or  # potential tables
-                '[' in message_str and '](' in message_str  # links
-            )
+        has_markdown = (not is_user) and _sniff_markdown(message_str)
+        
+        # Markdown can be rendered off the Qt thread: the raw text is shown as
+        # a placeholder until set_html() delivers the rendered HTML
+        self._has_markdown = False
+        self.render_pending = has_markdown and defer_render
         
         # Add message content with appropriate widget
-        if has_markdown:
-            # Convert markdown to HTML
-            html_content = markdown.markdown(
-                message_str,
-                extensions=['fenced_code', 'codehilite', 'tables']
-            )
-            
-            # Create a text browser for rich text display
-            message_display = QTextBrowser()
-            message_display.setOpenExternalLinks(True)
-            message_display.setHtml(html_content)
-            message_display.setReadOnly(True)
-            
-            # Style it based on the theme
-            if self.dark_mode:
-                message_display.setStyleSheet("""
-                    background-color: transparent;
-                    color: #E0E0E0;
-                    border: none;
-                    selection-background-color: #444444;
-                    padding: 5px;
-                """)
-                
-                # Add custom CSS for dark mode code blocks
-                html_content = html_content.replace(
-                    "<pre><code>", 
-                    "<pre style='background-color: #222222; border: 1px solid #444444; border-radius: 5px; padding: 8px; overflow-x: auto;'><code style='color: #E0E0E0;'>"
-                )
-            else:
-                message_display.setStyleSheet("""
-                    background-color: transparent;
-                    color: #333333;
-                    border: none;
-                    selection-background-color: #E3F2FD;
-                    padding: 5px;
-                """)
-                
-                # Add custom CSS for light mode code blocks
-                html_content = html_content.replace(
-                    "<pre><code>", 
-                    "<pre style='background-color: #F5F5F5; border: 1px solid #E0E0E0; border-radius: 5px; padding: 8px; overflow-x: auto;'><code style='color: #333333;'>"
-                )
-            
-            message_display.setHtml(html_content)
-            message_display.document().setDefaultStyleSheet("""
-                h1, h2, h3 { margin-top: 0.3em; margin-bottom: 0.3em; }
-                p { margin-top: 0.3em; margin-bottom: 0.3em; }
-                ul, ol { margin-top: 0.3em; margin-bottom: 0.3em; margin-left: 15px; padding-left: 15px; }
-                li { margin-bottom: 0.2em; }
-                pre { margin: 0.5em 0; white-space: pre-wrap; }
-                code { font-family: monospace; white-space: pre-wrap; }
-                table { border-collapse: collapse; margin: 0.5em 0; }
-                th, td { border: 1px solid #CCCCCC; padding: 6px; }
-                img { max-width: 100%; height: auto; }
-            """)
-            
-            # Make the widget size adjust to content appropriately
-            message_display.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            message_display.setMinimumHeight(30) # Reasonable minimum height
-            
-            # Calculate required height with appropriate padding
-            document_height = message_display.document().size().height() + 20
-            message_display.setMinimumHeight(int(min(document_height, 500)))
-            
-            # For markdown content, we need to handle width differently
-            document_width = message_display.document().idealWidth() 
-            
-            # Set width based on content to ensure proper display
-            if document_width < 50:
-                # Very minimal content
-                message_display.setMinimumWidth(int(max(document_width + 50, 150)))
-            elif document_width < 200:
-                # Short/medium content
-                message_display.setMinimumWidth(int(document_width + 60))
-            else:
-                # Longer content
-                message_display.setMinimumWidth(int(document_width + 40))
-                
-            # Cap maximum width
-            message_display.setMaximumWidth(650)
-            
-            main_layout.addWidget(message_display)
+        if has_markdown and not defer_render:
+            self._create_markdown_display(_render_markdown_html(message_str))
         else:
-            # Use a simple QLabel for plain text display
-            message_label = QLabel(message_str)
-            message_label.setWordWrap(True)
-            message_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-            
-            # Use appropriate size policy for text
-            message_label.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
-            
-            # Make sure text gets proper rendering space
-            fm = message_label.fontMetrics()
-            line_spacing = fm.lineSpacing()
-            line_count = message_str.count('\n') + 1
-            
-            # Calculate how much height we need for this text
-            text_height = line_count * line_spacing + 15
-            
-            # Set proper height for the text
-            message_label.setMinimumHeight(text_height)
-            
-            # Determine appropriate width based on content length
-            # content_length already defined at the top
-            
-            # Calculate a width that fits the content nicely
-            text_width = fm.horizontalAdvance(message_str[:min(30, content_length)]) + 20
-            
-            # Set minimum width based on content length for better appearance
-            if content_length < 10:
-                # For very short messages, ensure a reasonable minimum width
-                message_label.setMinimumWidth(max(text_width, 80))
-            else:
-                # Let width be determined by content with some padding
-                message_label.setMinimumWidth(0)  # Let the layout handle it
-                
-            # Apply appropriate text styling with padding
-            if self.is_user:
-                if self.dark_mode:
-                    message_label.setStyleSheet("""
-                        color: #121212; 
-                        font-weight: bold; 
-                        background-color: transparent; 
-                        font-size: 14px; 
-                        padding: 6px; 
-                        margin: 4px;
-                    """)
-                else:
-                    message_label.setStyleSheet("""
-                        color: white; 
-                        font-weight: bold; 
-                        background-color: transparent; 
-                        font-size: 14px; 
-                        padding: 6px; 
-                        margin: 4px;
-                    """)
-            else:
-                if self.dark_mode:
-                    message_label.setStyleSheet("""
-                        color: #E0E0E0; 
-                        background-color: transparent; 
-                        font-size: 14px; 
-                        padding: 6px; 
-                        margin: 4px;
-                    """)
-                else:
-                    message_label.setStyleSheet("""
-                        color: #333333; 
-                        background-color: transparent; 
-                        font-size: 14px; 
-                        padding: 6px; 
-                        margin: 4px;
-                    """)
-            
-            main_layout.addWidget(message_label)
+            self._create_text_label(message_str)
+        main_layout.addWidget(self._message_body)
+        
+        # The content's preferred width is fixed once it is built, so measure
+        # it once here instead of on every resize
+        self._content_width = self._message_body.sizeHint().width()
         
         # Use proper margins for content
         main_layout.setContentsMargins(10, 8, 10, 8)
@@ -283,95 +457,152 @@ class MessageWidget(QFrame):
         # Set size policy to allow the bubble to shrink to content
         self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
         
-        # RESPONSIVE SIZING IMPROVEMENT: Calculate proper width based on content and parent width
-        def update_bubble_size():
-            parent_width = self.parent().width() if self.parent() else 800
-            max_width = min(int(parent_width * 0.8), 650)  # Cap at 80% of parent width
-            
-            # Get content width
-            content_width = 0
-            for i in range(main_layout.count()):
-                item = main_layout.itemAt(i)
-                if item and item.widget():
-                    widget_width = item.widget().sizeHint().width()
-                    content_width = max(content_width, widget_width)
+        # Call once immediately to set initial size; later resizes of the chat
+        # area are handled by the ChatResizeFilter installed by AuroraUI
+        self.update_bubble_size()
+        
+        # Force the widget to shrink to fit its content exactly
+        self.adjustSize()
+    
+    def _create_markdown_display(self, html_content):
+        """Create and measure a text browser showing the rendered markdown"""
+        self._html = html_content
+        self._has_markdown = True
+        
+        # Create a text browser for rich text display
+        message_display = QTextBrowser()
+        message_display.setObjectName("messageDisplay")
+        message_display.setOpenExternalLinks(True)
+        self._message_body = message_display
+        
+        # Style the markdown document before measuring, since its size depends on it
+        self.apply_theme(self.dark_mode)
+        
+        # Make the widget size adjust to content appropriately
+        message_display.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
+        
+        # apply_theme has set the HTML exactly once; measure that layout
+        # for both the height and the width
+        document = message_display.document()
+        
+        # Calculate required height with appropriate padding
+        document_height = document.size().height() + 20
+        message_display.setMinimumHeight(int(min(document_height, 500)))
+        
+        # For markdown content, we need to handle width differently
+        document_width = document.idealWidth()
+        
+        # Set width based on content to ensure proper display
+        if document_width < 50:
+            # Very minimal content
+            message_display.setMinimumWidth(int(max(document_width + 50, 150)))
+        elif document_width < 200:
+            # Short/medium content
+            message_display.setMinimumWidth(int(document_width + 60))
+        else:
+            # Longer content
+            message_display.setMinimumWidth(int(document_width + 40))
             
-            # Determine minimum width based on content length
-            if has_markdown:
-                # For markdown content, use the values already calculated
-                min_width = message_display.minimumWidth() + 20
+        # Cap maximum width
+        message_display.setMaximumWidth(650)
+    
+    def _create_text_label(self, message_str):
+        """Create and measure a simple QLabel for plain text display"""
+        content_length = self._content_length
+        
+        message_label = QLabel(message_str)
+        message_label.setObjectName("messageLabel")
+        message_label.setProperty("user", self.is_user)
+        # Never sniff for rich text: plain text avoids building a rich text
+        # document and shows messages containing tags literally
+        message_label.setTextFormat(Qt.TextFormat.PlainText)
+        message_label.setWordWrap(True)
+        message_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self._message_body = message_label
+        
+        # Use appropriate size policy for text
+        message_label.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
+        
+        # Make sure text gets proper rendering space
+        fm = message_label.fontMetrics()
+        line_spacing = fm.lineSpacing()
+        line_count = message_str.count('\n') + 1
+        
+        # Calculate how much height we need for this text
+        text_height = line_count * line_spacing + 15
+        
+        # Set proper height for the text
+        message_label.setMinimumHeight(text_height)
+        
+        # Estimate a width that fits the content nicely without shaping the text
+        char_width = self._char_width or fm.averageCharWidth()
+        text_width = min(30, content_length) * char_width + 20
+        
+        # Set minimum width based on content length for better appearance
+        if content_length < 10:
+            # For very short messages, ensure a reasonable minimum width
+            message_label.setMinimumWidth(max(text_width, 80))
+        else:
+            # Let width be determined by content with some padding
+            message_label.setMinimumWidth(0)  # Let the layout handle it
+    
+    def history_record(self):
+        """Return the (content, is_user, source_type, timestamp) record for this message"""
+        return (self._message, self.is_user, self.source_type, self._sent_at)
+    
+    def set_html(self, html_content):
+        """Replace the plain text placeholder with the rendered markdown"""
+        placeholder = self._message_body
+        self._create_markdown_display(html_content)
+        self._main_layout.replaceWidget(placeholder, self._message_body)
+        placeholder.deleteLater()
+        self.render_pending = False
+        self._content_width = self._message_body.sizeHint().width()
+        self.update_bubble_size()
+    
+    def update_bubble_size(self):
+        """Calculate proper bubble width based on content and parent width"""
+        parent_width = self.parent().width() if self.parent() else 800
+        max_width = min(int(parent_width * 0.8), 650)  # Cap at 80% of parent width
+        
+        # Determine minimum width based on content length
+        content_width = self._content_width
+        content_length = self._content_length
+        if self._has_markdown:
+            # For markdown content, use the values already calculated
+            min_width = self._message_body.minimumWidth() + 20
+        else:
+            # For text content, calculate based on message length
+            if content_length < 10:
+                # Very short messages get proper padding
+                min_width = max(content_width + 40, 80)
+            elif content_length < 30:
+                # Short messages
+                min_width = max(content_width + 30, 120)
             else:
-                # For text content, calculate based on message length
-                if content_length < 10:
-                    # Very short messages get proper padding
-                    min_width = max(content_width + 40, 80)
-                elif content_length < 30:
-                    # Short messages
-                    min_width = max(content_width + 30, 120)
-                else:
-                    # Regular messages
-                    min_width = content_width + 20
-            
-            # Set width constraints - allow bubble to grow only as needed
-            self.setMinimumWidth(min(min_width, max_width))
-            self.setMaximumWidth(max_width)
-        
-        # Call once immediately to set initial size
-        update_bubble_size()
-        
-        # Install event filter to handle resize events
-        class ResizeEventFilter(QObject):
-            def __init__(self, target_widget, update_func):
-                super().__init__()
-                self.update_func = update_func
-                self.target_widget = target_widget
-            
-            def eventFilter(self, obj, event):
-                from PyQt6.QtCore import QEvent
-                if obj == self.target_widget and event.type() == QEvent.Type.Resize:
-                    self.update_func()
-                return False
-        
-        # Apply resize event filter to parent if available
-        if self.parent():
-            self.parent().installEventFilter(ResizeEventFilter(self.parent(), update_bubble_size))
+                # Regular messages
+                min_width = content_width + 20
         
-        # Apply styles to the frame with appropriate margins based on message source
-        side_margin = 20 if content_length < 20 else 40  # Less margin for short messages
+        # Set width constraints - allow bubble to grow only as needed
+        self.setMinimumWidth(min(min_width, max_width))
+        self.setMaximumWidth(max_width)
+    
+    def apply_theme(self, dark_mode):
+        """Apply the dark or light theme to this message without rebuilding it
         
-        if self.is_user:
-            if self.dark_mode:
-                self.setStyleSheet(f"""
-                    background-color: #BB86FC; 
-                    border-radius: 12px; 
-                    padding: 5px;
-                    margin-left: {side_margin}px;
-                """)
-            else:
-                self.setStyleSheet(f"""
-                    background-color: #2196F3; 
-                    border-radius: 12px; 
-                    padding: 5px;
-                    margin-left: {side_margin}px;
-                """)
-        else:
-            if self.dark_mode:
-                self.setStyleSheet(f"""
-                    background-color: #333333; 
-                    border-radius: 12px; 
-                    padding: 5px;
-                    margin-right: {side_margin}px;
-                """)
-            else:
-                self.setStyleSheet(f"""
-                    background-color: #F5F5F5; 
-                    border-radius: 12px; 
-                    padding: 5px;
-                    margin-right: {side_margin}px;
-                """)
+        Widget colours come from the window stylesheet, so only the markdown
+        document, which Qt styles separately, needs updating here.
+        """
+        self.dark_mode = dark_mode
+        if not self._has_markdown:
+            return
         
-        # Force the widget to shrink to fit its content exactly
-        self.adjustSize()
+        # Code blocks are styled through the document stylesheet rather than
+        # inline in the HTML. It only applies to content set after it, so the
+        # cached HTML is set again whenever the theme changes.
+        message_display = self._message_body
+        message_display.document().setDefaultStyleSheet(_DOC_CSS_DARK if dark_mode else _DOC_CSS_LIGHT)
+        message_display.setHtml(self._html)
         
     def resizeEvent(self, event):
         """Handle resize events to adjust bubble sizing"""
@@ -384,6 +615,21 @@ class MessageWidget(QFrame):
         max_width = min(int(parent_width * 0.8), 650)
         self.setMaximumWidth(max_width)
 
+class ChatResizeFilter(QObject):
+    """Single event filter that resizes every message bubble when the chat area width changes"""
+    def __init__(self, chat_layout, parent=None):
+        super().__init__(parent)
+        self.chat_layout = chat_layout
+    
+    def eventFilter(self, obj, event):
+        # Height changes on every new message, only width affects bubble sizes
+        if event.type() == QEvent.Type.Resize and event.size().width() != event.oldSize().width():
+            for i in range(self.chat_layout.count()):
+                widget = self.chat_layout.itemAt(i).widget()
+                if isinstance(widget, MessageWidget):
+                    widget.update_bubble_size()
+        return False
+
 class StatusIndicator(QLabel):
     """Status indicator widget to show current system state"""
     def __init__(self, parent=None, dark_mode=False):
@@ -458,6 +704,20 @@ class AuroraSignals(QObject):
     """Signal class for communicating between threads"""
     message_received = pyqtSignal(str, bool, object)  # message, is_user, source_type
     status_changed = pyqtSignal(str)  # status name
+    html_ready = pyqtSignal(str, str)  # render id, rendered html
+
+class STTMessage:
+    """Transcribed speech passed to the graph, marked so the UI hook knows its source"""
+    __slots__ = ('text', 'from_stt', 'timestamp')
+    
+    def __init__(self, text):
+        self.text = text
+        self.from_stt = True
+        # Time marker used to uniquely identify this message
+        self.timestamp = datetime.now().timestamp()
+    
+    def __str__(self):
+        return self.text
 
 class AuroraUI(QMainWindow):
     """Main UI class for Aurora"""
@@ -476,11 +736,37 @@ class AuroraUI(QMainWindow):
         
         # Setup signals
         self.signals = AuroraSignals()
-        self.signals.message_received.connect(self.add_message)
-        self.signals.status_changed.connect(self.update_status)
-        
-        # Message queue for thread-safe access
-        self.message_queue = queue.Queue()
+        self.signals.message_received.connect(self._enqueue_message)
+        self.signals.status_changed.connect(self._enqueue_status)
+        self.signals.html_ready.connect(self._on_html_ready)
+        
+        # Messages emitted by worker threads are collected and added at most
+        # once per frame
+        self._pending_messages = []
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(16)
+        self._frame_timer.timeout.connect(self._flush_pending_updates)
+        
+        # STT/TTS callbacks can flip the status at audio-callback rate; only the
+        # latest status within each 50 ms window is applied
+        self._pending_status = None
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(50)
+        self._status_timer.timeout.connect(self._flush_pending_status)
+        
+        # Message widgets waiting for their markdown to be rendered, by render id
+        self._pending_renders = {}
+        self._next_render_id = 0
+        
+        # Messages are processed by a fixed set of reused worker threads instead
+        # of a new thread each. They are daemon threads, unlike a QThreadPool's,
+        # so closing the window never waits for a reply still being generated,
+        # and they are separate from the global pool used for markdown rendering.
+        self._process_queue = queue.Queue()
+        for _ in range(max(2, (os.cpu_count() or 2) // 2)):
+            Thread(target=self._process_worker_loop, daemon=True).start()
         
         # Store original STT and TTS callbacks
         self.original_on_recording_start = None
@@ -490,34 +776,89 @@ class AuroraUI(QMainWindow):
         self.original_on_audio_stream_start = None
         self.original_on_audio_stream_stop = None
         
+        # Graph and TTS entry points, resolved once in hook_into_systems
+        self._process_text_input = None
+        self._stream_graph_updates = None
+        self._tts_stop = None
+        
         # Debug mode for verbose logging
         self.debug_mode = config_manager.get('ui.debug', False)
         
+        # Last status shown, so repeated emits of the same state are skipped
+        self._last_status = None
+        
+        # Only the most recent page of replayed history gets widgets up front;
+        # older messages are kept as (content, is_user, source_type, timestamp) records
+        # until the user asks for them
+        self._history_page_size = max(1, int(config_manager.get('ui.history_page_size', 50)))
+        self._unrealized_history = []
+        
+        # Cap on message widgets kept in the chat; the oldest are turned back
+        # into history records once it is exceeded
+        self._max_messages = max(1, int(config_manager.get('ui.max_visible_messages', 500)))
+        
+        # Older pages are also built on demand when the chat is scrolled to the
+        # top; the anchor keeps the view on the same message while they are added
+        self._scroll_anchor = None
+        
+        # New messages only scroll the chat while it is parked at the bottom,
+        # so reading further up is not interrupted
+        self._autoscroll = True
+        self._autoscroll_threshold = 20
+        
+        self._chat_vsb.valueChanged.connect(self._on_chat_scrolled)
+        self._chat_vsb.rangeChanged.connect(self._on_chat_range_changed)
+        
         # Store last UI message to avoid duplication
         self._last_ui_message = None
         
+        # Average character width for sizing short message bubbles, measured once
+        self._avg_char_width = QFontMetrics(QFont()).averageCharWidth()
+        
         # Initialize database message history service
         self.message_history = get_message_history_service()
         
+        # New messages and settings are stored by a single writer thread so
+        # the GUI never waits on the database or config backend
+        self._db_queue = queue.Queue()
+        Thread(target=self._db_writer_loop, daemon=True).start()
+        
         # Load today's messages or show welcome message
         self.load_todays_messages()
         
     def load_todays_messages(self):
         """Load today's messages from database or show welcome message if none exist"""
+        # Insert everything with updates off so the chat lays out and repaints
+        # once for the whole history instead of once per message
+        chat_widget = self._chat_content
+        chat_widget.setUpdatesEnabled(False)
+        try:
+            self._load_todays_messages()
+        finally:
+            chat_widget.setUpdatesEnabled(True)
+            chat_widget.updateGeometry()
+    
+    def _load_todays_messages(self):
+        """Add today's persisted messages, or the welcome message, to the chat"""
         try:
             # Get today's messages from database
             today_messages = self.message_history.get_today_messages()
             
             if today_messages:
                 log_debug(f"UI: Loading {len(today_messages)} messages from today")
-                # Add each message to the UI
-                for msg in today_messages:
-                    # Use the Message model methods to get UI properties
-                    is_user = msg.is_user_message()
-                    source_type = msg.get_ui_source_type()
-                    
+                # Use the Message model methods to get UI properties
+                records = [
+                    (msg.content, msg.is_user_message(), msg.get_ui_source_type(), self._message_timestamp(msg))
+                    for msg in today_messages
+                ]
+                
+                # Keep older messages as records, build widgets for the latest page
+                split = max(0, len(records) - self._history_page_size)
+                self._unrealized_history = records[:split]
+                for content, is_user, source_type, timestamp in records[split:]:
                     # Add message to UI without storing in database again
-                    self._add_message_to_ui_only(msg.content, is_user, source_type)
+                    self._add_message_to_ui_only(content, is_user, source_type, timestamp)
+                self.load_older_button.setVisible(bool(self._unrealized_history))
                     
                 log_debug("UI: Loaded persisted messages from today")
             else:
@@ -527,7 +868,9 @@ class AuroraUI(QMainWindow):
                 
         except Exception as e:
             log_error(f"Error loading today's messages: {e}")
-            # Fallback to welcome message
+            # Fallback to welcome message, without leaving older pages behind
+            # that could only be reached by scrolling
+            self._unrealized_history = []
             self._show_welcome_message()
     
     def _show_welcome_message(self):
@@ -549,16 +892,80 @@ You can interact with the assistant in two ways:
 """
         self._add_message_to_ui_only(welcome_markdown, False, None)
     
-    def _add_message_to_ui_only(self, message, is_user=False, source_type=None):
+    @staticmethod
+    def _message_timestamp(msg):
+        """Return when a persisted message was sent as a POSIX timestamp, if known
+        
+        Anything that is not a datetime, an ISO formatted string or a number
+        gives None, so the bubble falls back to the current time.
+        """
+        timestamp = getattr(msg, 'timestamp', None)
+        if isinstance(timestamp, str):
+            try:
+                timestamp = datetime.fromisoformat(timestamp)
+            except ValueError:
+                return None
+        if isinstance(timestamp, datetime):
+            return timestamp.timestamp()
+        if isinstance(timestamp, (int, float)):
+            return timestamp
+        return None
+    
+    def _add_message_to_ui_only(self, message, is_user=False, source_type=None, timestamp=None):
         """Add a message to UI without storing in database (for loading persisted messages)"""
-        log_debug(f"UI: Adding message to UI only: '{message[:30]}...' User: {is_user} Source: {source_type}")
+        if self.debug_mode:
+            log_debug(f"UI: Adding message to UI only: '{_trunc(message)}' User: {is_user} Source: {source_type}")
         
-        message_widget = MessageWidget(message, is_user, dark_mode=self.dark_mode, source_type=source_type)
-        self.chat_layout.insertWidget(self.chat_layout.count() - 1, message_widget)
+        message_widget = MessageWidget(message, is_user, self._chat_content, dark_mode=self.dark_mode, source_type=source_type, timestamp=timestamp, char_width=self._avg_char_width)
+        self.chat_layout.addWidget(message_widget)
+
+    def load_older_messages(self):
+        """Build widgets for the next page of older history above the current messages"""
+        page = self._unrealized_history[-self._history_page_size:]
+        del self._unrealized_history[-self._history_page_size:]
+        log_debug(f"UI: Loading {len(page)} older messages")
+        
+        # Remember where the current first message sits in the viewport so the
+        # visible messages stay put once the new ones above them are laid out.
+        # Its offset is used rather than the distance from the bottom, which
+        # also changes when hiding the load older button resizes the viewport.
+        first_widget = self.chat_layout.itemAt(0).widget() if self.chat_layout.count() else None
+        if first_widget is not None and self._chat_vsb.maximum() > 0:
+            self._scroll_anchor = (first_widget, first_widget.y(), first_widget.y() - self._chat_vsb.value())
+        
+        chat_widget = self._chat_content
+        chat_widget.setUpdatesEnabled(False)
+        try:
+            for i, (content, is_user, source_type, timestamp) in enumerate(page):
+                message_widget = MessageWidget(content, is_user, chat_widget, dark_mode=self.dark_mode, source_type=source_type, timestamp=timestamp, char_width=self._avg_char_width)
+                self.chat_layout.insertWidget(i, message_widget)
+        finally:
+            chat_widget.setUpdatesEnabled(True)
         
-        # Scroll to bottom
-        from PyQt6.QtCore import QTimer
-        QTimer.singleShot(100, self._ensure_scroll_to_bottom)
+        self.load_older_button.setVisible(bool(self._unrealized_history))
+    
+    def _on_chat_scrolled(self, value):
+        """Track whether the chat is at the bottom and load older history at the top"""
+        self._autoscroll = value >= self._chat_vsb.maximum() - self._autoscroll_threshold
+        if self._unrealized_history and value == self._chat_vsb.minimum() and self._chat_vsb.maximum() > 0:
+            self.load_older_messages()
+    
+    def _on_chat_range_changed(self, minimum, maximum):
+        """Keep the chat pinned as its content grows
+        
+        Qt emits this once the new extent is laid out, so the chat follows new
+        messages while parked at the bottom, and keeps the position saved before
+        older messages were added above.
+        """
+        if self._scroll_anchor is not None:
+            # The viewport may resize before the new messages are laid out, so
+            # the anchor is kept until the anchored message has actually moved
+            anchor_widget, anchor_y, offset = self._scroll_anchor
+            self._chat_vsb.setValue(anchor_widget.y() - offset)
+            if anchor_widget.y() != anchor_y:
+                self._scroll_anchor = None
+        elif self._autoscroll:
+            self._chat_vsb.setValue(maximum)
 
     def init_ui(self):
         """Initialize the UI components"""
@@ -579,35 +986,46 @@ You can interact with the assistant in two ways:
         # Add some spacing
         main_layout.addSpacing(5)
         
+        # Button to show older history that was not built on startup
+        self.load_older_button = QPushButton("Load older messages")
+        self.load_older_button.setMinimumHeight(30)
+        self.load_older_button.clicked.connect(self.load_older_messages)
+        self.load_older_button.hide()
+        main_layout.addWidget(self.load_older_button)
+        
         # Chat history area
         chat_scroll = QScrollArea()
         chat_scroll.setWidgetResizable(True)
         chat_scroll.setFrameShape(QFrame.Shape.NoFrame)  # Remove border for cleaner look
         
         chat_widget = QWidget()
+        chat_widget.setObjectName("chatContent")
+        self._chat_content = chat_widget
+        
+        # The stretch that keeps messages at the top lives in an outer layout,
+        # so the chat layout itself only ever holds messages and is appended to
+        outer_layout = QVBoxLayout(chat_widget)
+        outer_layout.setContentsMargins(10, 10, 10, 10)
+        outer_layout.setSpacing(0)
         
-        # Set background color based on theme
-        if self.dark_mode:
-            chat_widget.setStyleSheet("background-color: #121212;")
-        else:
-            chat_widget.setStyleSheet("background-color: white;")
-            
         # Set chat layout for balanced spacing
-        self.chat_layout = QVBoxLayout(chat_widget)
-        self.chat_layout.setContentsMargins(10, 10, 10, 10)
+        self.chat_layout = QVBoxLayout()
+        self.chat_layout.setContentsMargins(0, 0, 0, 0)
         self.chat_layout.setSpacing(8)  # Proper spacing between messages
-        self.chat_layout.addStretch()
+        outer_layout.addLayout(self.chat_layout)
+        outer_layout.addStretch()
         chat_scroll.setWidget(chat_widget)
+        self._chat_vsb = chat_scroll.verticalScrollBar()
+        
+        # One resize filter for the whole chat instead of one per message
+        self._chat_resize_filter = ChatResizeFilter(self.chat_layout, self)
+        chat_widget.installEventFilter(self._chat_resize_filter)
+        
         main_layout.addWidget(chat_scroll, stretch=1)
         
         # Bottom panel for input
-        bottom_panel = QWidget()
-        if self.dark_mode:
-            bottom_panel.setStyleSheet("background-color: #1E1E1E; border-top: 1px solid #333333; padding: 10px;")
-        else:
-            bottom_panel.setStyleSheet("background-color: #F5F5F5; border-top: 1px solid #E0E0E0; padding: 10px;")
-        
-        bottom_layout = QVBoxLayout(bottom_panel)
+        self.bottom_panel = QWidget()
+        bottom_layout = QVBoxLayout(self.bottom_panel)
         bottom_layout.setContentsMargins(5, 10, 5, 5)
         
         # Input area
@@ -643,30 +1061,6 @@ You can interact with the assistant in two ways:
         self.input_field.setPlaceholderText("Type your message here (press Enter to send, Shift+Enter for newline)...")
         self.input_field.setMaximumHeight(80)
         
-        # Round the corners of the input field
-        if self.dark_mode:
-            self.input_field.setStyleSheet("""
-                QTextEdit {
-                    background-color: #2D2D2D;
-                    color: #E0E0E0;
-                    border: 1px solid #444444;
-                    border-radius: 12px;
-                    padding: 8px 12px;
-                    font-size: 14px;
-                }
-            """)
-        else:
-            self.input_field.setStyleSheet("""
-                QTextEdit {
-                    background-color: white;
-                    color: #333333;
-                    border: 1px solid #CCCCCC;
-                    border-radius: 12px;
-                    padding: 8px 12px;
-                    font-size: 14px;
-                }
-            """)
-        
         input_layout.addWidget(self.input_field, stretch=1)
         
         # Send button - styled to look modern
@@ -674,47 +1068,6 @@ You can interact with the assistant in two ways:
         self.send_button.setMinimumHeight(40)
         self.send_button.setMaximumWidth(100)
         
-        if self.dark_mode:
-            self.send_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #BB86FC;
-                    color: #121212;
-                    border: none;
-                    border-radius: 12px;
-                    padding: 8px 16px;
-                    font-weight: bold;
-                    font-size: 13px;
-                }
-                
-                QPushButton:hover {
-                    background-color: #A66EFC;
-                }
-                
-                QPushButton:pressed {
-                    background-color: #7B41CE;
-                }
-            """)
-        else:
-            self.send_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #2196F3;
-                    color: white;
-                    border: none;
-                    border-radius: 12px;
-                    padding: 8px 16px;
-                    font-weight: bold;
-                    font-size: 13px;
-                }
-                
-                QPushButton:hover {
-                    background-color: #1976D2;
-                }
-                
-                QPushButton:pressed {
-                    background-color: #0D47A1;
-                }
-            """)
-        
         self.send_button.clicked.connect(self.send_message)
         input_layout.addWidget(self.send_button)
         
@@ -735,40 +1088,13 @@ You can interact with the assistant in two ways:
         self.dark_mode_button.setMinimumHeight(35)
         self.dark_mode_button.clicked.connect(self.toggle_dark_mode)
         
-        # Style the control buttons
-        button_style = """
-            QPushButton {
-                background-color: %s;
-                color: %s;
-                border: none;
-                border-radius: 8px;
-                padding: 4px 12px;
-                font-size: 12px;
-            }
-            
-            QPushButton:hover {
-                background-color: %s;
-            }
-            
-            QPushButton:pressed {
-                background-color: %s;
-            }
-        """
-        
-        if self.dark_mode:
-            self.stop_button.setStyleSheet(button_style % ('#333333', '#E0E0E0', '#444444', '#222222'))
-            self.dark_mode_button.setStyleSheet(button_style % ('#333333', '#E0E0E0', '#444444', '#222222'))
-        else:
-            self.stop_button.setStyleSheet(button_style % ('#E0E0E0', '#333333', '#CCCCCC', '#BBBBBB'))
-            self.dark_mode_button.setStyleSheet(button_style % ('#E0E0E0', '#333333', '#CCCCCC', '#BBBBBB'))
-        
         voice_layout.addWidget(self.stop_button)
         voice_layout.addWidget(self.dark_mode_button)
         voice_layout.addStretch(1)  # Add stretch to align buttons to the left
         
         bottom_layout.addLayout(voice_layout)
         
-        main_layout.addWidget(bottom_panel)
+        main_layout.addWidget(self.bottom_panel)
         
         # Set app style
         self.apply_style()
@@ -776,127 +1102,47 @@ You can interact with the assistant in two ways:
     def apply_style(self):
         """Apply custom styling to the application"""
         if self.dark_mode:
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #1E1E1E;
-                    color: #E0E0E0;
-                }
-                
-                QWidget {
-                    background-color: #1E1E1E;
-                    color: #E0E0E0;
-                }
-                
-                QScrollArea {
-                    border: none;
-                    background-color: #121212;
-                }
-                
-                QScrollBar:vertical {
-                    background: #2D2D2D;
-                    width: 10px;
-                    margin: 0px;
-                }
-                
-                QScrollBar::handle:vertical {
-                    background: #555555;
-                    min-height: 20px;
-                    border-radius: 5px;
-                }
-                
-                QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                    height: 0px;
-                }
-                
-                QScrollBar:horizontal {
-                    background: #2D2D2D;
-                    height: 10px;
-                    margin: 0px;
-                }
-                
-                QScrollBar::handle:horizontal {
-                    background: #555555;
-                    min-width: 20px;
-                    border-radius: 5px;
-                }
-                
-                QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-                    width: 0px;
-                }
-                
-                QLabel {
-                    font-size: 14px;
-                    color: #E0E0E0;
-                }
-                
-                QTextBrowser {
-                    background-color: transparent;
-                    color: #E0E0E0;
-                    border: none;
-                    selection-background-color: #444444;
-                }
-            """)
+            self.setStyleSheet(_QSS_DARK_MAIN)
+            self._chat_content.setStyleSheet(_CHAT_CONTENT_DARK)
+            self.bottom_panel.setStyleSheet(_QSS_DARK_BOTTOM)
+            self.input_field.setStyleSheet(_QSS_DARK_INPUT)
+            self.send_button.setStyleSheet(_QSS_DARK_SEND_BTN)
+            control_style = _QSS_DARK_CONTROL_BTN
         else:
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: white;
-                    color: #333333;
-                }
-                
-                QWidget {
-                    background-color: white;
-                    color: #333333;
-                }
-                
-                QScrollArea {
-                    border: none;
-                    background-color: white;
-                }
-                
-                QScrollBar:vertical {
-                    background: #F5F5F5;
-                    width: 10px;
-                    margin: 0px;
-                }
-                
-                QScrollBar::handle:vertical {
-                    background: #CCCCCC;
-                    min-height: 20px;
-                    border-radius: 5px;
-                }
-                
-                QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                    height: 0px;
-                }
-                
-                QScrollBar:horizontal {
-                    background: #F5F5F5;
-                    height: 10px;
-                    margin: 0px;
-                }
-                
-                QScrollBar::handle:horizontal {
-                    background: #CCCCCC;
-                    min-width: 20px;
-                    border-radius: 5px;
-                }
-                
-                QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-                    width: 0px;
-                }
-                
-                QLabel {
-                    font-size: 14px;
-                    color: #333333;
-                }
-                
-                QTextBrowser {
-                    background-color: transparent;
-                    color: #333333;
-                    border: none;
-                    selection-background-color: #E3F2FD;
-                }
-            """)
+            self.setStyleSheet(_QSS_LIGHT_MAIN)
+            self._chat_content.setStyleSheet(_CHAT_CONTENT_LIGHT)
+            self.bottom_panel.setStyleSheet(_QSS_LIGHT_BOTTOM)
+            self.input_field.setStyleSheet(_QSS_LIGHT_INPUT)
+            self.send_button.setStyleSheet(_QSS_LIGHT_SEND_BTN)
+            control_style = _QSS_LIGHT_CONTROL_BTN
+        
+        self.stop_button.setStyleSheet(control_style)
+        self.dark_mode_button.setStyleSheet(control_style)
+        self.load_older_button.setStyleSheet(control_style)
+    
+    def _enqueue_message(self, message, is_user=False, source_type=None):
+        """Queue a message from a worker thread for the next frame"""
+        self._pending_messages.append((message, is_user, source_type))
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+    
+    def _enqueue_status(self, status):
+        """Queue a status change from a worker thread, keeping only the latest"""
+        self._pending_status = status
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+    
+    def _flush_pending_status(self):
+        """Apply the latest queued status"""
+        status, self._pending_status = self._pending_status, None
+        if status is not None:
+            self.update_status(status)
+    
+    def _flush_pending_updates(self):
+        """Add all queued messages at once"""
+        messages, self._pending_messages = self._pending_messages, []
+        for message, is_user, source_type in messages:
+            self.add_message(message, is_user, source_type)
     
     def add_message(self, message, is_user=False, source_type=None):
         """Add a message to the chat history and store in database
@@ -907,38 +1153,69 @@ You can interact with the assistant in two ways:
             source_type: The source of the message ("Text", "STT", or None)
         """
         # Debug logging
-        log_debug(f"UI: Adding message to chat: '{message[:30]}...' User: {is_user} Source: {source_type}")
-        
-        # Add to UI
-        message_widget = MessageWidget(message, is_user, dark_mode=self.dark_mode, source_type=source_type)
-        self.chat_layout.insertWidget(self.chat_layout.count() - 1, message_widget)
-        
-        # Store in database
-        try:
-            # Store message in database using appropriate method
-            if is_user:
-                if source_type == "STT":
-                    self.message_history.store_user_voice_message(str(message))
-                else:
-                    self.message_history.store_user_text_message(str(message))
+        if self.debug_mode:
+            log_debug(f"UI: Adding message to chat: '{_trunc(message)}' User: {is_user} Source: {source_type}")
+        
+        # Add to UI; markdown is rendered in the background
+        message_widget = MessageWidget(message, is_user, self._chat_content, dark_mode=self.dark_mode, source_type=source_type, defer_render=True, char_width=self._avg_char_width)
+        self.chat_layout.addWidget(message_widget)
+        if message_widget.render_pending:
+            render_id = str(self._next_render_id)
+            self._next_render_id += 1
+            self._pending_renders[render_id] = message_widget
+            QThreadPool.globalInstance().start(MarkdownRenderTask(self.signals, render_id, str(message)))
+        self._trim_chat()
+        
+        # Store in database using the appropriate method, on the writer thread
+        if is_user:
+            if source_type == "STT":
+                store = self.message_history.store_user_voice_message
             else:
-                self.message_history.store_assistant_message(str(message))
-            
-            log_debug(f"UI: Stored message in database (User: {is_user}, Source: {source_type})")
-            
-        except Exception as e:
-            log_error(f"Error storing message in database: {e}")
+                store = self.message_history.store_user_text_message
+        else:
+            store = self.message_history.store_assistant_message
+        self._db_queue.put_nowait((store, (str(message),)))
+    
+    def _db_writer_loop(self):
+        """Run queued writes one at a time, off the GUI thread"""
+        while True:
+            store, args = self._db_queue.get()
+            try:
+                store(*args)
+                if self.debug_mode:
+                    log_debug(f"UI: Completed background write ({store.__name__})")
+            except Exception as e:
+                log_error(f"Error in background write ({store.__name__}): {e}")
+            finally:
+                self._db_queue.task_done()
+    
+    def _trim_chat(self):
+        """Drop the oldest message widgets beyond the cap back into the unrealized history
         
-        # Scroll to bottom - use a brief delay to ensure the UI has updated
-        from PyQt6.QtCore import QTimer
-        QTimer.singleShot(100, self._ensure_scroll_to_bottom)
+        Nothing is dropped while the user has scrolled up, so the messages being
+        read do not move; the excess is trimmed on the next message at the bottom.
+        """
+        if not self._autoscroll:
+            return
+        
+        excess = self.chat_layout.count() - self._max_messages
+        for _ in range(excess):
+            message_widget = self.chat_layout.takeAt(0).widget()
+            if message_widget.render_pending:
+                for render_id, widget in list(self._pending_renders.items()):
+                    if widget is message_widget:
+                        del self._pending_renders[render_id]
+            self._unrealized_history.append(message_widget.history_record())
+            message_widget.deleteLater()
+        
+        if excess > 0:
+            self.load_older_button.setVisible(True)
     
-    def _ensure_scroll_to_bottom(self):
-        """Scroll to the bottom of the chat area"""
-        scroll_area = self.findChild(QScrollArea)
-        if scroll_area:
-            vsb = scroll_area.verticalScrollBar()
-            vsb.setValue(vsb.maximum())
+    def _on_html_ready(self, render_id, html_content):
+        """Swap a message's placeholder for its rendered markdown"""
+        message_widget = self._pending_renders.pop(render_id, None)
+        if message_widget is not None:
+            message_widget.set_html(html_content)
     
     def send_message(self):
         """Handle sending a text message"""
@@ -946,11 +1223,16 @@ You can interact with the assistant in two ways:
         if not message:
             return
         
-        log_debug(f"UI: Sending message: {message[:30] if len(message) > 30 else message}")
+        if self.debug_mode:
+            log_debug(f"UI: Sending message: {_trunc(message)}")
+        
+        # Sending always brings the conversation back into view
+        self._autoscroll = True
         
         # IMPORTANT: Add user message to chat with 'Text' source type
         self.add_message(message, is_user=True, source_type="Text")
-        log_debug(f"UI: Added user message to UI")
+        if self.debug_mode:
+            log_debug("UI: Added user message to UI")
         
         # Clear input field
         self.input_field.clear()
@@ -958,7 +1240,8 @@ You can interact with the assistant in two ways:
         # Set a flag to indicate this was processed by the UI
         # This will be checked by the graph updates hook to avoid duplicate display
         self._last_ui_message = message
-        log_debug(f"UI: Set last UI message: {message[:30] if len(message) > 30 else message}")
+        if self.debug_mode:
+            log_debug(f"UI: Set last UI message: {_trunc(message)}")
         
         # Process message
         self.process_message(message)
@@ -974,17 +1257,22 @@ You can interact with the assistant in two ways:
         # Create a thread to process the message to avoid UI freezing
         async def process_in_thread():
             try:
-                # Import the text-only processing function for UI input
-                from app.langgraph.graph import process_text_input
+                # The text-only processing function for UI input, imported here
+                # only when the UI runs without hook_into_systems
+                process_text_input = self._process_text_input
+                if process_text_input is None:
+                    from app.langgraph.graph import process_text_input
                 
-                log_debug(f"UI: Processing text input in thread: {message_str[:30]}...")
+                if self.debug_mode:
+                    log_debug(f"UI: Processing text input in thread: {_trunc(message_str)}")
                 
                 # Use the text-only processing function (no TTS)
                 response = await process_text_input(message)
                 
                 # Update the UI with the response
                 if response and response != "END":
-                    log_debug(f"UI: Received text response: {response[:30]}...")
+                    if self.debug_mode:
+                        log_debug(f"UI: Received text response: {_trunc(response)}")
                     # IMPORTANT: Add response to UI (since we're not using TTS hook)
                     # No source type since it's an AI response
                     self.signals.message_received.emit(response, False, None)
@@ -995,14 +1283,22 @@ You can interact with the assistant in two ways:
                 log_error(f"Error in processing thread: {e}")
                 self.signals.status_changed.emit("idle")
         
-        # Start processing thread
-        Thread(target=lambda: run_async_in_thread(process_in_thread()), daemon=True).start()
+        # Start processing on a worker thread
+        self._process_queue.put_nowait(process_in_thread())
     
     def update_status(self, status):
         """Update the status indicator"""
         if self.debug_mode:
             log_debug(f"UI Status changed to: {status}")
-            
+        
+        # This status is newer than any still waiting in the throttle
+        self._pending_status = None
+        self._status_timer.stop()
+        
+        if status == self._last_status:
+            return
+        self._last_status = status
+        
         if status == "idle":
             self.status_indicator.set_idle()
         elif status == "listening":
@@ -1015,207 +1311,105 @@ You can interact with the assistant in two ways:
     
     def process_stt_message(self, text):
         """Process a message coming from STT"""
-        log_debug(f"UI: Processing STT message: {text}")
+        if self.debug_mode:
+            log_debug(f"UI: Processing STT message: {text}")
         
         # Update status to show we're processing
         self.signals.status_changed.emit("processing")
         
-        # Create a custom message object to track the source
-        # This helps us avoid duplicating the message in the UI
-        class STTMessage:
-            def __init__(self, text):
-                self.text = text
-                self.from_stt = True
-                # Time marker used to uniquely identify this message
-                from datetime import datetime
-                self.timestamp = datetime.now().timestamp()
-            
-            def __str__(self):
-                return self.text
-        
         # Process the STT message - the UI update will happen in ui_stream_graph_updates
         stt_msg = STTMessage(text)
-        log_debug(f"UI: Sending marked STT message to processing: {text[:30]}...")
+        if self.debug_mode:
+            log_debug(f"UI: Sending marked STT message to processing: {_trunc(text)}")
         
         # Process in a thread to avoid blocking UI
         async def process_in_thread():
             try:
-                # Import here to avoid circular imports
-                # Use stream_graph_updates for STT which will use TTS
-                from app.langgraph.graph import stream_graph_updates
+                # Use stream_graph_updates for STT which will use TTS; the hooked
+                # version handles the UI update, and it is imported here only
+                # when the UI runs without hook_into_systems
+                stream_graph_updates = self._stream_graph_updates
+                if stream_graph_updates is None:
+                    from app.langgraph.graph import stream_graph_updates
                 
-                # Let stream_graph_updates handle the UI update through our hook
                 response = await stream_graph_updates(stt_msg)
                 
                 if response and response != "END":
-                    log_debug(f"UI: Received STT response: {response[:30]}...")
+                    if self.debug_mode:
+                        log_debug(f"UI: Received STT response: {_trunc(response)}")
                     # IMPORTANT: Add response to UI explicitly to ensure it's displayed
                     # This is a fallback in case the TTS hook doesn't work correctly
                     self.signals.message_received.emit(response, False, None)
-                    log_debug(f"UI: Explicitly added STT response to chat")
+                    if self.debug_mode:
+                        log_debug("UI: Explicitly added STT response to chat")
                 
             except Exception as e:
                 log_error(f"Error processing STT message: {e}")
                 self.signals.status_changed.emit("idle")
 
-        Thread(target=lambda: run_async_in_thread(process_in_thread()), daemon=True).start()
+        self._process_queue.put_nowait(process_in_thread())
     
     def stop_voice(self):
         """Stop voice processing"""
-        from app.text_to_speech.tts import stop
         log_debug("UI: Stopping voice")
-        stop()
+        tts_stop = self._tts_stop
+        if tts_stop is None:
+            from app.text_to_speech.tts import stop as tts_stop
+        tts_stop()
         self.update_status("idle")
         
     def toggle_dark_mode(self):
         """Toggle between dark and light mode"""
         self.dark_mode = not self.dark_mode
         
-        # Update the UI style
+        # Update the UI style from the precomputed sheets
         self.apply_style()
         
         # Update status indicator
         self.status_indicator.dark_mode = self.dark_mode
-        self.status_indicator.set_idle()
+        status, self._last_status = self._pending_status or self._last_status, None
+        self.update_status(status or "idle")
         
-        # Update chat widget background
-        chat_scroll = self.findChild(QScrollArea)
-        if chat_scroll and chat_scroll.widget():
-            if self.dark_mode:
-                chat_scroll.widget().setStyleSheet("background-color: #121212;")
-            else:
-                chat_scroll.widget().setStyleSheet("background-color: white;")
-        
-        # Update bottom panel
-        for widget in self.findChildren(QWidget):
-            if hasattr(widget, 'styleSheet') and 'border-top: 1px solid' in widget.styleSheet():
-                if self.dark_mode:
-                    widget.setStyleSheet("background-color: #1E1E1E; border-top: 1px solid #333333; padding: 10px;")
-                else:
-                    widget.setStyleSheet("background-color: #F5F5F5; border-top: 1px solid #E0E0E0; padding: 10px;")
-        
-        # Update input field style
-        if self.dark_mode:
-            self.input_field.setStyleSheet("""
-                QTextEdit {
-                    background-color: #2D2D2D;
-                    color: #E0E0E0;
-                    border: 1px solid #444444;
-                    border-radius: 12px;
-                    padding: 8px 12px;
-                    font-size: 14px;
-                }
-            """)
-        else:
-            self.input_field.setStyleSheet("""
-                QTextEdit {
-                    background-color: white;
-                    color: #333333;
-                    border: 1px solid #CCCCCC;
-                    border-radius: 12px;
-                    padding: 8px 12px;
-                    font-size: 14px;
-                }
-            """)
+        # Restyle existing messages in place instead of rebuilding them, with
+        # painting held off so the chat repaints once rather than per message
+        chat_widget = self._chat_content
+        chat_widget.setUpdatesEnabled(False)
+        try:
+            for i in range(self.chat_layout.count()):
+                widget = self.chat_layout.itemAt(i).widget()
+                if isinstance(widget, MessageWidget):
+                    widget.apply_theme(self.dark_mode)
+        finally:
+            chat_widget.setUpdatesEnabled(True)
+        
+        # Save the preference on the writer thread so a slow config backend
+        # does not hold up the toggle
+        self._db_queue.put_nowait((config_manager.set, ('ui.dark_mode', self.dark_mode)))
+    
+    def _process_worker_loop(self):
+        """Run queued message processing coroutines one at a time on this thread"""
+        while True:
+            coroutine = self._process_queue.get()
+            try:
+                run_async_in_thread(coroutine)
+            except Exception as e:
+                log_error(f"Error in processing thread: {e}")
+    
+    def closeEvent(self, event):
+        """Finish any queued database writes before the window closes
         
-        # Update buttons style
-        button_style = """
-            QPushButton {
-                background-color: %s;
-                color: %s;
-                border: none;
-                border-radius: 8px;
-                padding: 4px 12px;
-                font-size: 12px;
-            }
-            
-            QPushButton:hover {
-                background-color: %s;
-            }
-            
-            QPushButton:pressed {
-                background-color: %s;
-            }
+        Messages still waiting to be processed are dropped; replies already
+        running end with the process.
         """
+        while True:
+            try:
+                coroutine = self._process_queue.get_nowait()
+            except queue.Empty:
+                break
+            coroutine.close()
         
-        if self.dark_mode:
-            self.stop_button.setStyleSheet(button_style % ('#333333', '#E0E0E0', '#444444', '#222222'))
-            self.dark_mode_button.setStyleSheet(button_style % ('#333333', '#E0E0E0', '#444444', '#222222'))
-            self.send_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #BB86FC;
-                    color: #121212;
-                    border: none;
-                    border-radius: 12px;
-                    padding: 8px 16px;
-                    font-weight: bold;
-                    font-size: 13px;
-                }
-                
-                QPushButton:hover {
-                    background-color: #A66EFC;
-                }
-                
-                QPushButton:pressed {
-                    background-color: #7B41CE;
-                }
-            """)
-        else:
-            self.stop_button.setStyleSheet(button_style % ('#E0E0E0', '#333333', '#CCCCCC', '#BBBBBB'))
-            self.dark_mode_button.setStyleSheet(button_style % ('#E0E0E0', '#333333', '#CCCCCC', '#BBBBBB'))
-            self.send_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #2196F3;
-                    color: white;
-                    border: none;
-                    border-radius: 12px;
-                    padding: 8px 16px;
-                    font-weight: bold;
-                    font-size: 13px;
-                }
-                
-                QPushButton:hover {
-                    background-color: #1976D2;
-                }
-                
-                QPushButton:pressed {
-                    background-color: #0D47A1;
-                }
-            """)
-        
-        # Refresh existing messages
-        for i in range(self.chat_layout.count()):
-            widget = self.chat_layout.itemAt(i).widget()
-            if isinstance(widget, MessageWidget):
-                # Create a new message widget with the same content but updated styling
-                message_content = ""
-                source_type = None
-                is_user = widget.is_user
-                
-                # Find the original message content
-                for child in widget.findChildren(QLabel) + widget.findChildren(QTextBrowser):
-                    if not child.styleSheet() or "font-size: 10px" not in child.styleSheet():
-                        # This is not a timestamp or source tag, it's the main content
-                        if isinstance(child, QLabel):
-                            message_content = child.text()
-                        elif isinstance(child, QTextBrowser):
-                            message_content = child.toPlainText()
-                
-                # Find source type if it exists
-                for child in widget.findChildren(QLabel):
-                    if "border-radius: 10px" in child.styleSheet() and child.text() in ["Text", "STT"]:
-                        source_type = child.text()
-                
-                # Remove the old widget
-                old_widget = self.chat_layout.takeAt(i).widget()
-                old_widget.deleteLater()
-                
-                # Create and add a new widget with the same content
-                new_widget = MessageWidget(message_content, is_user, dark_mode=self.dark_mode, source_type=source_type)
-                self.chat_layout.insertWidget(i, new_widget)
-        
-        # Save preference to environment variable
-        config_manager.get('ui.dark_mode') == 'true' if self.dark_mode else 'false'
+        self._db_queue.join()
+        super().closeEvent(event)
     
     # Methods to hook into the existing STT/TTS system
     def hook_into_systems(self):
@@ -1224,6 +1418,11 @@ You can interact with the assistant in two ways:
         import app.speech_to_text.stt as stt
         import app.text_to_speech.tts as tts
         from app.speech_to_text.audio_recorder import AudioToTextRecorder
+        from app.langgraph.graph import process_text_input
+        
+        # Keep the entry points used per message so they are not imported on every send
+        self._process_text_input = process_text_input
+        self._tts_stop = tts.stop
         
         # Store original callbacks
         self.original_on_recording_start = stt.on_recording_start
@@ -1294,16 +1493,11 @@ You can interact with the assistant in two ways:
         
         async def ui_stream_graph_updates(user_input):
             try:
-                # Convert to string for logging
+                # Convert to string once for display and logging
                 input_str = str(user_input)
                 
-                # Log first 30 chars of input, safely
-                if len(input_str) > 30:
-                    log_str = input_str[:30] + "..."
-                else:
-                    log_str = input_str
-                    
-                log_debug(f"UI: Processing user input: {log_str}")
+                if self.debug_mode:
+                    log_debug(f"UI: Processing user input: {_trunc(input_str)}")
                 
                 # Track if this is an STT message for deduplication later
                 is_stt_message = hasattr(user_input, 'from_stt') and user_input.from_stt
@@ -1311,20 +1505,24 @@ You can interact with the assistant in two ways:
                 # IMPORTANT: Check input source and display user message accordingly
                 if is_stt_message:
                     # This is from STT - add to UI first, then process
-                    log_debug(f"UI: Adding STT message to chat: {log_str}")
+                    if self.debug_mode:
+                        log_debug(f"UI: Adding STT message to chat: {_trunc(input_str)}")
                     self.signals.message_received.emit(input_str, True, "STT")
                 elif hasattr(self, '_last_ui_message') and self._last_ui_message == input_str:
                     # Message from text input - already displayed in send_message
-                    log_debug(f"UI: Message from UI input, already displayed")
+                    if self.debug_mode:
+                        log_debug("UI: Message from UI input, already displayed")
                     # Reset the flag to avoid future conflicts
                     self._last_ui_message = None
                 else:
                     # Any other source - add to UI to be safe
-                    log_debug(f"UI: Adding message to chat from unknown source: {log_str}")
+                    if self.debug_mode:
+                        log_debug(f"UI: Adding message to chat from unknown source: {_trunc(input_str)}")
                     self.signals.message_received.emit(input_str, True, None)
                 
                 # Call the original function - only used by STT which needs TTS output
-                log_debug("UI: Calling original stream_graph_updates")
+                if self.debug_mode:
+                    log_debug("UI: Calling original stream_graph_updates")
                 response = await original_stream_graph_updates(user_input)
                 
                 # No need to manually add the response to UI here as:
@@ -1339,6 +1537,7 @@ You can interact with the assistant in two ways:
         
         # Replace the original function with our patched version
         lg.stream_graph_updates = ui_stream_graph_updates
+        self._stream_graph_updates = ui_stream_graph_updates
 
 # For testing the UI independently
 if __name__ == "__main__":